@@ -1,80 +1,116 @@
 #!/usr/bin/env python3
 
 import ssl
-import getpass
 import time
-from pyVim.connect import SmartConnect, Disconnect
 from pyVmomi import vim
+from vsphere_common import *
 
-def read_config(filename='vconnect_starter.txt'):
-    """Read vCenter hostname and username from the starter file"""
-    config = {}
-    with open(filename, 'r') as f:
-        content = f.read()
-        
-        if 'host=' in content:
-            start = content.find('host=') + 6
-            end = content.find('"', start)
-            config['vcenter_host'] = content[start:end]
-        
-        if 'user=' in content:
-            start = content.find('user=') + 6
-            end = content.find('"', start)
-            config['username'] = content[start:end]
-    
-    return config
+def _escape_path(name):
+    """Escape an inventory name for use as one inventory path segment"""
+    return name.replace('%', '%25').replace('/', '%2f')
 
-def get_session_info(si, vcenter_host):
-    """Display current session information"""
-    session_mgr = si.content.sessionManager
-    current_session = session_mgr.currentSession
-    
-    print("\n=== Current Session Information ===")
-    print(f"DOMAIN/Username: {current_session.userName}")
-    print(f"vCenter Server: {vcenter_host}")
-    print(f"Source IP Address: {current_session.ipAddress}")
-    print("=" * 40)
+def find_vm_by_name(content, name):
+    """Look up a VM by its exact name through the SearchIndex"""
+    if not name:
+        return None
+    
+    search_index = content.searchIndex
+    
+    # Guest hostname usually matches the VM name; confirm before trusting it
+    vm = search_index.FindByDnsName(None, name, True)
+    if vm and vm.name == name:
+        return vm
+    
+    # Only top-level datacenters; ones nested inside folders are not searched
+    for entity in content.rootFolder.childEntity:
+        if isinstance(entity, vim.Datacenter):
+            path = f"{_escape_path(entity.name)}/vm/{_escape_path(name)}"
+            vm = search_index.FindByInventoryPath(path)
+            if isinstance(vm, vim.VirtualMachine):
+                return vm
+    
+    return None
 
-def search_vms(si, name_filter=None):
-    """Search for VMs by name filter. If no filter, return all VMs"""
-    content = si.RetrieveContent()
-    container = content.rootFolder
-    view_type = [vim.VirtualMachine]
-    recursive = True
-    
-    container_view = content.viewManager.CreateContainerView(
-        container, view_type, recursive
-    )
+def _batch_props(content, vms, paths):
+    """Read the given properties for a list of VMs in one RetrieveContents call"""
+    if not vms:
+        return {}
     
-    vms = container_view.view
-    container_view.Destroy()
+    obj_specs = [vim.PropertyCollector.ObjectSpec(obj=vm) for vm in vms]
+    prop_spec = vim.PropertyCollector.PropertySpec(
+        type=vim.VirtualMachine,
+        pathSet=paths
+    )
+    filter_spec = vim.PropertyCollector.FilterSpec(
+        objectSet=obj_specs,
+        propSet=[prop_spec]
+    )
     
-    # Filter VMs if name_filter provided
-    if name_filter:
-        vms = [vm for vm in vms if name_filter.lower() in vm.name.lower()]
+    results = content.propertyCollector.RetrieveContents([filter_spec])
     
-    return vms
+    return {
+        obj_content.obj._moId: {prop.name: prop.val for prop in obj_content.propSet}
+        for obj_content in results
+    }
 
-def display_vm_info(vms):
-    """Display VM metadata"""
-    if not vms:
-        print("\nNo VMs found!")
-        return
-        
-    print(f"\n{'VM Name':<30} {'Power State':<15} {'CPUs':<8} {'Memory (GB)':<12} {'IP Address':<15}")
-    print("=" * 90)
+def wait_for_tasks(content, tasks):
+    """Block until every task finishes, returning {moId: {'state', 'error'}}"""
+    if not tasks:
+        return {}
+    
+    obj_specs = [vim.PropertyCollector.ObjectSpec(obj=task) for task in tasks]
+    prop_spec = vim.PropertyCollector.PropertySpec(
+        type=vim.Task,
+        pathSet=['info.state', 'info.error'],
+        all=False
+    )
+    filter_spec = vim.PropertyCollector.FilterSpec(
+        objectSet=obj_specs,
+        propSet=[prop_spec]
+    )
     
-    for vm in vms:
-        name = vm.name
-        power_state = vm.runtime.powerState
-        num_cpu = vm.config.hardware.numCPU
-        memory_gb = vm.config.hardware.memoryMB / 1024
-        
-        ip_address = "N/A"
-        if vm.guest.ipAddress:
-            ip_address = vm.guest.ipAddress
-        
-        print(f"{name:<30} {power_state:<15} {num_cpu:<8} {memory_gb:<12.2f} {ip_address:<15}")
+    # A private collector only ever reports this call's filter, even if an
+    # earlier run left filters behind on the reused session's collector
+    pc = content.propertyCollector.CreatePropertyCollector()
+    pending = {task._moId for task in tasks}
+    results = {task._moId: {'state': None, 'error': None} for task in tasks}
+    finished = (vim.TaskInfo.State.success, vim.TaskInfo.State.error)
+    version = ''
+    
+    try:
+        pc.CreateFilter(filter_spec, True)
+        while pending:
+            update = pc.WaitForUpdatesEx(version)
+            if update is None:
+                continue
+            version = update.version
+            
+            for filter_set in update.filterSet:
+                for obj_set in filter_set.objectSet:
+                    moId = obj_set.obj._moId
+                    for change in obj_set.changeSet:
+                        if change.name == 'info.error':
+                            results[moId]['error'] = change.val
+                        elif change.name == 'info.state':
+                            results[moId]['state'] = change.val
+                    
+                    if results[moId]['state'] in finished:
+                        pending.discard(moId)
+    finally:
+        pc.Destroy()
+    
+    return results
+
+def _prompt_int(prompt, valid):
+    """Keep asking until the user enters one of the valid menu numbers"""
+    while True:
+        try:
+            value = int(input(prompt))
+            if value in valid:
+                return value
+        except ValueError:
+            pass
+        print("Invalid option. Please try again.")
 
 def vmmenu():
     """Display VM Actions menu"""
@@ -86,95 +122,124 @@ def vmmenu():
     print("[6] Rename a VM")
     print("[0] Exit the VM Actions.")
 
-def power_on_vm(si):
-    """Power on one or more VMs"""
-    print("\n=== Power On VM(s) ===")
-    
-    vms = search_vms(si)
+def _pick_vm(content, action, allow_all=False):
+    """List the VMs, ask for one by name and return the matching inventory rows"""
+    vms = search_vms(content)
     print("\nVMs managed by vCenter:")
     for vm in vms:
-        print(f"  - {vm.name}")
+        print(f"  - {vm['name']}")
+    
+    if allow_all:
+        vm_name = input(f"\nEnter VM name to {action} (leave empty for ALL): ").strip()
+        if not vm_name:
+            confirm = input(f"Are you sure you want to {action} ALL VMs? (Y/N): ").strip().upper()
+            if confirm != 'Y':
+                print("Cancelled.")
+                return []
+            return vms
+    else:
+        vm_name = input(f"\nEnter VM name to {action}: ").strip()
+        
+        # An exact name wins over substring matches; both come from the cache
+        exact = [vm for vm in vms if vm['name'] == vm_name]
+        if exact:
+            return exact[:1]
+    
+    target_vms = search_vms(content, vm_name)
+    if target_vms:
+        return target_vms
+    
+    # Only ask vCenter when the cached inventory has no match (e.g. a new VM)
+    if not allow_all:
+        vm = find_vm_by_name(content, vm_name)
+        if vm is not None:
+            return [{'moRef': vm, 'name': vm_name}]
+    
+    print(f"No VM found matching '{vm_name}'")
+    return []
+
+def power_on_vm(content):
+    """Power on one or more VMs"""
+    print("\n=== Power On VM(s) ===")
     
-    vm_name = input("\nEnter VM name to power on (leave empty for ALL): ").strip()
+    target_vms = _pick_vm(content, "power on", allow_all=True)
+    if not target_vms:
+        return
     
-    if vm_name:
-        target_vms = [vm for vm in vms if vm_name.lower() in vm.name.lower()]
-        if not target_vms:
-            print(f"No VM found matching '{vm_name}'")
-            return
-    else:
-        confirm = input("Are you sure you want to power on ALL VMs? (Y/N): ").strip().upper()
-        if confirm != 'Y':
-            print("Cancelled.")
-            return
-        target_vms = vms
+    states = _batch_props(content, [target['moRef'] for target in target_vms],
+                          ['runtime.powerState'])
     
-    for vm in target_vms:
-        if vm.runtime.powerState == vim.VirtualMachinePowerState.poweredOn:
-            print(f"{vm.name} is already powered on, skipping!")
+    tasks = []
+    for target in target_vms:
+        vm, name = target['moRef'], target['name']
+        power_state = states.get(vm._moId, {}).get('runtime.powerState')
+        if power_state == vim.VirtualMachinePowerState.poweredOn:
+            print(f"{name} is already powered on, skipping!")
         else:
-            print(f"{vm.name} is not powered on, powering on now!")
+            print(f"{name} is not powered on, powering on now!")
             try:
-                task = vm.PowerOn()
-                time.sleep(2)
-                print(f"{vm.name} is now powered on!")
+                tasks.append((name, vm.PowerOnVM_Task()))
             except Exception as e:
-                print(f"Failed to power on {vm.name}: {e}")
+                print(f"Failed to power on {name}: {e}")
+    
+    results = wait_for_tasks(content, [task for name, task in tasks])
+    
+    for name, task in tasks:
+        result = results[task._moId]
+        if result['state'] == vim.TaskInfo.State.success:
+            print(f"{name} is now powered on!")
+        else:
+            print(f"Failed to power on {name}: {result['error'].msg}")
+    
+    invalidate_vm_cache()
 
-def power_off_vm(si):
+def power_off_vm(content):
     """Power off one or more VMs"""
     print("\n=== Power Off VM(s) ===")
     
-    vms = search_vms(si)
-    print("\nVMs managed by vCenter:")
-    for vm in vms:
-        print(f"  - {vm.name}")
+    target_vms = _pick_vm(content, "power off", allow_all=True)
+    if not target_vms:
+        return
     
-    vm_name = input("\nEnter VM name to power off (leave empty for ALL): ").strip()
+    states = _batch_props(content, [target['moRef'] for target in target_vms],
+                          ['runtime.powerState'])
     
-    if vm_name:
-        target_vms = [vm for vm in vms if vm_name.lower() in vm.name.lower()]
-        if not target_vms:
-            print(f"No VM found matching '{vm_name}'")
-            return
-    else:
-        confirm = input("Are you sure you want to power off ALL VMs? (Y/N): ").strip().upper()
-        if confirm != 'Y':
-            print("Cancelled.")
-            return
-        target_vms = vms
-    
-    for vm in target_vms:
-        if vm.runtime.powerState == vim.VirtualMachinePowerState.poweredOff:
-            print(f"{vm.name} is already powered off, skipping!")
+    tasks = []
+    for target in target_vms:
+        vm, name = target['moRef'], target['name']
+        power_state = states.get(vm._moId, {}).get('runtime.powerState')
+        if power_state == vim.VirtualMachinePowerState.poweredOff:
+            print(f"{name} is already powered off, skipping!")
         else:
-            print(f"{vm.name} is powered on, powering off now!")
+            print(f"{name} is powered on, powering off now!")
             try:
-                task = vm.PowerOff()
-                time.sleep(2)
-                print(f"{vm.name} is now powered off!")
+                tasks.append((name, vm.PowerOffVM_Task()))
             except Exception as e:
-                print(f"Failed to power off {vm.name}: {e}")
+                print(f"Failed to power off {name}: {e}")
+    
+    results = wait_for_tasks(content, [task for name, task in tasks])
+    
+    for name, task in tasks:
+        result = results[task._moId]
+        if result['state'] == vim.TaskInfo.State.success:
+            print(f"{name} is now powered off!")
+        else:
+            print(f"Failed to power off {name}: {result['error'].msg}")
+    
+    invalidate_vm_cache()
 
-def create_snapshot(si):
+def create_snapshot(content):
     """Create a snapshot of a VM"""
     print("\n=== Take a Snapshot ===")
     
-    vms = search_vms(si)
-    print("\nVMs managed by vCenter:")
-    for vm in vms:
-        print(f"  - {vm.name}")
-    
-    vm_name = input("\nEnter VM name to snapshot: ").strip()
-    
-    target_vms = [vm for vm in vms if vm_name.lower() in vm.name.lower()]
+    target_vms = _pick_vm(content, "snapshot")
     if not target_vms:
-        print(f"No VM found matching '{vm_name}'")
         return
     
-    vm = target_vms[0]
+    vm = target_vms[0]['moRef']
+    vm_name = target_vms[0]['name']
     
-    confirm = input(f"Create snapshot of '{vm.name}'? (Y/N): ").strip().upper()
+    confirm = input(f"Create snapshot of '{vm_name}'? (Y/N): ").strip().upper()
     if confirm != 'Y':
         print("Cancelled.")
         return
@@ -185,7 +250,7 @@ def create_snapshot(si):
     
     snapshot_description = input("Enter snapshot description (optional): ").strip()
     
-    print(f"\nCreating snapshot '{snapshot_name}' for {vm.name}...")
+    print(f"\nCreating snapshot '{snapshot_name}' for {vm_name}...")
     try:
         task = vm.CreateSnapshot(
             name=snapshot_name,
@@ -197,43 +262,39 @@ def create_snapshot(si):
     except Exception as e:
         print(f"Failed to create snapshot: {e}")
 
-def delete_vm(si):
+def delete_vm(content):
     """Delete a VM from disk"""
     print("\n=== Delete a VM ===")
     
-    vms = search_vms(si)
-    print("\nVMs managed by vCenter:")
-    for vm in vms:
-        print(f"  - {vm.name}")
-    
-    vm_name = input("\nEnter VM name to DELETE: ").strip()
-    
-    target_vms = [vm for vm in vms if vm_name.lower() in vm.name.lower()]
+    target_vms = _pick_vm(content, "DELETE")
     if not target_vms:
-        print(f"No VM found matching '{vm_name}'")
         return
     
-    vm = target_vms[0]
+    vm = target_vms[0]['moRef']
+    vm_name = target_vms[0]['name']
     
-    print(f"\n WARNING: You are about to DELETE '{vm.name}' permanently!")
-    confirm1 = input(f"Are you ABSOLUTELY SURE you want to delete '{vm.name}'? (YES/NO): ").strip().upper()
+    print(f"\n WARNING: You are about to DELETE '{vm_name}' permanently!")
+    confirm1 = input(f"Are you ABSOLUTELY SURE you want to delete '{vm_name}'? (YES/NO): ").strip().upper()
     if confirm1 != 'YES':
         print("Cancelled.")
         return
     
-    confirm2 = input(f"Type the VM name '{vm.name}' to confirm deletion: ").strip()
-    if confirm2 != vm.name:
+    confirm2 = input(f"Type the VM name '{vm_name}' to confirm deletion: ").strip()
+    if confirm2 != vm_name:
         print("VM name does not match. Deletion cancelled.")
         return
     
     if vm.runtime.powerState != vim.VirtualMachinePowerState.poweredOff:
-        print(f"\n{vm.name} must be powered off before deletion.")
+        print(f"\n{vm_name} must be powered off before deletion.")
         power_off = input("Power off now? (Y/N): ").strip().upper()
         if power_off == 'Y':
             try:
-                task = vm.PowerOff()
-                time.sleep(2)
-                print(f"{vm.name} powered off.")
+                task = vm.PowerOffVM_Task()
+                result = wait_for_tasks(content, [task])[task._moId]
+                if result['state'] != vim.TaskInfo.State.success:
+                    print(f"Failed to power off: {result['error'].msg}")
+                    return
+                print(f"{vm_name} powered off.")
             except Exception as e:
                 print(f"Failed to power off: {e}")
                 return
@@ -241,37 +302,35 @@ def delete_vm(si):
             print("Deletion cancelled.")
             return
     
-    print(f"\nDeleting {vm.name} from disk...")
+    print(f"\nDeleting {vm_name} from disk...")
     try:
         task = vm.Destroy_Task()
-        print(f"✓ {vm.name} has been deleted successfully!")
+        result = wait_for_tasks(content, [task])[task._moId]
+        invalidate_vm_cache()
+        if result['state'] != vim.TaskInfo.State.success:
+            print(f"Failed to delete VM: {result['error'].msg}")
+            return
+        print(f"✓ {vm_name} has been deleted successfully!")
     except Exception as e:
         print(f"Failed to delete VM: {e}")
 
-def reconfigure_vm(si):
+def reconfigure_vm(content):
     """Reconfigure VM CPU and Memory"""
     print("\n=== Reconfigure a VM ===")
     
-    vms = search_vms(si)
-    print("\nVMs managed by vCenter:")
-    for vm in vms:
-        print(f"  - {vm.name}")
-    
-    vm_name = input("\nEnter VM name to reconfigure: ").strip()
-    
-    target_vms = [vm for vm in vms if vm_name.lower() in vm.name.lower()]
+    target_vms = _pick_vm(content, "reconfigure")
     if not target_vms:
-        print(f"No VM found matching '{vm_name}'")
         return
     
-    vm = target_vms[0]
+    vm = target_vms[0]['moRef']
+    vm_name = target_vms[0]['name']
     
     if vm.runtime.powerState != vim.VirtualMachinePowerState.poweredOff:
-        print(f"\n {vm.name} must be powered off to reconfigure hardware!")
+        print(f"\n {vm_name} must be powered off to reconfigure hardware!")
         print("Please power off the VM first.")
         return
     
-    confirm = input(f"Reconfigure '{vm.name}'? (Y/N): ").strip().upper()
+    confirm = input(f"Reconfigure '{vm_name}'? (Y/N): ").strip().upper()
     if confirm != 'Y':
         print("Cancelled.")
         return
@@ -302,10 +361,15 @@ def reconfigure_vm(si):
     if new_memory_gb:
         config_spec.memoryMB = new_memory_gb * 1024
     
-    print(f"\nReconfiguring {vm.name}...")
+    print(f"\nReconfiguring {vm_name}...")
     try:
         task = vm.Reconfigure(spec=config_spec)
-        print(f"✓ {vm.name} has been reconfigured!")
+        result = wait_for_tasks(content, [task])[task._moId]
+        invalidate_vm_cache()
+        if result['state'] != vim.TaskInfo.State.success:
+            print(f"Failed to reconfigure VM: {result['error'].msg}")
+            return
+        print(f"✓ {vm_name} has been reconfigured!")
         if new_cpu:
             print(f"  - CPUs: {new_cpu}")
         if new_memory_gb:
@@ -313,25 +377,18 @@ def reconfigure_vm(si):
     except Exception as e:
         print(f"Failed to reconfigure VM: {e}")
 
-def rename_vm(si):
+def rename_vm(content):
     """Rename a VM"""
     print("\n=== Rename a VM ===")
     
-    vms = search_vms(si)
-    print("\nVMs managed by vCenter:")
-    for vm in vms:
-        print(f"  - {vm.name}")
-    
-    vm_name = input("\nEnter VM name to rename: ").strip()
-    
-    target_vms = [vm for vm in vms if vm_name.lower() in vm.name.lower()]
+    target_vms = _pick_vm(content, "rename")
     if not target_vms:
-        print(f"No VM found matching '{vm_name}'")
         return
     
-    vm = target_vms[0]
+    vm = target_vms[0]['moRef']
+    vm_name = target_vms[0]['name']
     
-    confirm = input(f"Rename '{vm.name}'? (Y/N): ").strip().upper()
+    confirm = input(f"Rename '{vm_name}'? (Y/N): ").strip().upper()
     if confirm != 'Y':
         print("Cancelled.")
         return
@@ -341,9 +398,14 @@ def rename_vm(si):
         print("Name cannot be empty")
         return
     
-    print(f"\nRenaming {vm.name} to {new_name}...")
+    print(f"\nRenaming {vm_name} to {new_name}...")
     try:
         task = vm.Rename(newName=new_name)
+        result = wait_for_tasks(content, [task])[task._moId]
+        invalidate_vm_cache()
+        if result['state'] != vim.TaskInfo.State.success:
+            print(f"Failed to rename VM: {result['error'].msg}")
+            return
         print(f"✓ VM renamed successfully to '{new_name}'!")
     except Exception as e:
         print(f"Failed to rename VM: {e}")
@@ -357,112 +419,80 @@ def main():
     print(f"vCenter Host: {vcenter_host}")
     print(f"Username: {username}")
     
-    password = getpass.getpass(f"\nEnter password for {username}: ")
-    
-    print("Connecting to vCenter...")
-    s = ssl.SSLContext(ssl.PROTOCOL_TLSv1_2)
-    s.verify_mode = ssl.CERT_NONE
-    
-    si = SmartConnect(host=vcenter_host, 
-                     user=username, 
-                     pwd=password, 
-                     sslContext=s)
+    s = ssl._create_unverified_context()
     
-    aboutInfo = si.content.about
-    print(aboutInfo)
+    si = connect_vcenter(vcenter_host, username, s)
     
-    get_session_info(si, vcenter_host)
-    
-    option = 0
-    
-def main():
-    print("Reading configuration from vconnect_starter.txt...")
-    config = read_config('vconnect_starter.txt')
-    vcenter_host = config['vcenter_host']
-    username = config['username']
-    
-    print(f"vCenter Host: {vcenter_host}")
-    print(f"Username: {username}")
-    
-    password = getpass.getpass(f"\nEnter password for {username}: ")
-    
-    print("Connecting to vCenter...")
-    s = ssl.SSLContext(ssl.PROTOCOL_TLSv1_2)
-    s.verify_mode = ssl.CERT_NONE
-    
-    si = SmartConnect(host=vcenter_host, 
-                     user=username, 
-                     pwd=password, 
-                     sslContext=s)
-    
-    aboutInfo = si.content.about
-    print(aboutInfo)
-    
-    get_session_info(si, vcenter_host)
-    
-    # Main menu loop
-    while True:
-        print("\n[1] VCenter Info")
-        print("[2] Session Details")
-        print("[3] VM Details")
-        print("[4] Perform VM Actions")
-        print("[0] Exit the program.")
-        
-        option = int(input("Enter your option: "))
-        
-        if option == 1:
-            print("VCenter Info Option Selected.")
-            aboutInfo = si.content.about
-            print(aboutInfo)
+    # Release the connection however the menu loop ends (incl. Ctrl-C)
+    try:
+        content = si.RetrieveContent()
         
-        elif option == 2:
-            print("Session Details Selected.")
-            get_session_info(si, vcenter_host)
+        about = content.about
+        print(about)
         
-        elif option == 3:
-            print("VM Details Selected.")
-            name_filter = input("Enter VM name to search (leave empty for all): ").strip()
-            if name_filter:
-                vms = search_vms(si, name_filter)
-            else:
-                vms = search_vms(si)
-            display_vm_info(vms)
+        get_session_info(content, vcenter_host)
         
-        elif option == 4:
-            print()
-            vmmenu()
-            vmoption = int(input("Enter your option: "))
+        # Main menu loop
+        while True:
+            print("\n[1] VCenter Info")
+            print("[2] Session Details")
+            print("[3] VM Details")
+            print("[4] Perform VM Actions")
+            print("[0] Exit the program.")
             
-            while vmoption != 0:
-                if vmoption == 1:
-                    power_on_vm(si)
-                
-                elif vmoption == 2:
-                    power_off_vm(si)
-                
-                elif vmoption == 3:
-                    create_snapshot(si)
-                
-                elif vmoption == 4:
-                    delete_vm(si)
-                
-                elif vmoption == 5:
-                    reconfigure_vm(si)
-                
-                elif vmoption == 6:
-                    rename_vm(si)
-                
+            option = _prompt_int("Enter your option: ", {0, 1, 2, 3, 4})
+            
+            if option == 1:
+                print("VCenter Info Option Selected.")
+                print(about)
+            
+            elif option == 2:
+                print("Session Details Selected.")
+                get_session_info(content, vcenter_host)
+            
+            elif option == 3:
+                print("VM Details Selected.")
+                name_filter = input("Enter VM name to search (leave empty for all): ").strip()
+                if name_filter:
+                    vms = search_vms(content, name_filter)
+                else:
+                    vms = search_vms(content)
+                display_vm_info(vms)
+            
+            elif option == 4:
+                print()
                 vmmenu()
-                vmoption = int(input("Enter your option: "))
-        
-        elif option == 0:
-            print("Exiting program...")
-            Disconnect(si)
-            print("Goodbye!")
-            break
-        
-        else:
-            print("Invalid option. Please try again.")
+                vmoption = _prompt_int("Enter your option: ", {0, 1, 2, 3, 4, 5, 6})
+                
+                while vmoption != 0:
+                    if vmoption == 1:
+                        power_on_vm(content)
+                    
+                    elif vmoption == 2:
+                        power_off_vm(content)
+                    
+                    elif vmoption == 3:
+                        create_snapshot(content)
+                    
+                    elif vmoption == 4:
+                        delete_vm(content)
+                    
+                    elif vmoption == 5:
+                        reconfigure_vm(content)
+                    
+                    elif vmoption == 6:
+                        rename_vm(content)
+                    
+                    vmmenu()
+                    vmoption = _prompt_int("Enter your option: ", {0, 1, 2, 3, 4, 5, 6})
+            
+            elif option == 0:
+                print("Exiting program...")
+                print("Closing connection (session kept for next run)...")
+                print("Goodbye!")
+                break
+    finally:
+        close_connection(si)
 
 if __name__ == "__main__":
     main()
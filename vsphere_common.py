@@ -0,0 +1,210 @@
+"""Shared vCenter helpers used by 5.2Menu.py and vm_manager.py"""
+
+import os
+import json
+import re
+import sys
+import getpass
+import time
+from pyVim.connect import SmartConnect
+from pyVmomi import vim, SoapStubAdapter
+
+__all__ = [
+    'read_config',
+    'get_session_info',
+    'connect_vcenter',
+    'close_connection',
+    'search_vms',
+    'display_vm_info',
+    'invalidate_vm_cache',
+]
+
+# Matches key="value" or key='value' pairs in the starter file
+_CFG_RE = re.compile(r"""(\w+)\s*=\s*(["'])(.*?)\2""")
+
+_CFG_KEYS = {'host': 'vcenter_host', 'user': 'username'}
+
+SESSION_FILE = os.path.expanduser('~/.vconnect_session')
+
+VM_CACHE_TTL = 30  # seconds
+
+_vm_cache = {'ts': 0, 'vms': None}
+
+VM_PROPERTIES = [
+    'name',
+    'runtime.powerState',
+    'config.hardware.numCPU',
+    'config.hardware.memoryMB',
+    'guest.ipAddress',
+]
+
+def read_config(filename='vconnect_starter.txt'):
+    """Read vCenter hostname and username from the starter file"""
+    with open(filename, 'r') as f:
+        content = f.read()
+    
+    config = {}
+    for key, _, value in _CFG_RE.findall(content):
+        if key in _CFG_KEYS and _CFG_KEYS[key] not in config:
+            config[_CFG_KEYS[key]] = value
+    
+    return config
+
+def get_session_info(content, vcenter_host):
+    """Display current session information"""
+    session_mgr = content.sessionManager
+    current_session = session_mgr.currentSession
+    
+    print("\n=== Current Session Information ===")
+    print(f"DOMAIN/Username: {current_session.userName}")
+    print(f"vCenter Server: {vcenter_host}")
+    print(f"Source IP Address: {current_session.ipAddress}")
+    print("=" * 40)
+
+def load_session(vcenter_host, username, sslContext):
+    """Reattach to the session saved by a previous run, None if it is gone"""
+    try:
+        with open(SESSION_FILE, 'r') as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    if saved.get('host') != vcenter_host or saved.get('user') != username:
+        return None
+    
+    stub = SoapStubAdapter(host=vcenter_host,
+                           version=saved.get('version'),
+                           sslContext=sslContext)
+    stub.cookie = saved.get('cookie', '')
+    si = vim.ServiceInstance("ServiceInstance", stub)
+    
+    # An expired cookie still connects but has no current session
+    try:
+        if si.content.sessionManager.currentSession is None:
+            return None
+    except Exception:
+        return None
+    
+    return si
+
+def save_session(si, vcenter_host, username):
+    """Write the session cookie to SESSION_FILE (owner read/write only)"""
+    fd = os.open(SESSION_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    os.fchmod(fd, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        json.dump({
+            'host': vcenter_host,
+            'user': username,
+            'version': si._stub.version,
+            'cookie': si._stub.cookie,
+        }, f)
+
+def connect_vcenter(vcenter_host, username, sslContext):
+    """Reuse a saved session if it is still valid, otherwise log in"""
+    si = load_session(vcenter_host, username, sslContext)
+    if si:
+        print("Reusing saved vCenter session...")
+        return si
+    
+    password = getpass.getpass(f"\nEnter password for {username}: ")
+    
+    print("Connecting to vCenter...")
+    si = SmartConnect(host=vcenter_host, 
+                     user=username, 
+                     pwd=password, 
+                     sslContext=sslContext)
+    
+    # Caching the session is optional; a failed write must not leak the login
+    try:
+        save_session(si, vcenter_host, username)
+    except OSError as e:
+        print(f"Warning: could not save session to {SESSION_FILE}: {e}")
+    
+    return si
+
+def close_connection(si):
+    """Close the sockets but leave the session logged in for the next run"""
+    si._stub.DropConnections()
+
+def retrieve_vm_properties(content):
+    """Fetch metadata for every VM in a single PropertyCollector call"""
+    # A recursive ContainerView reaches every VM, including ones inside vApps
+    container_view = content.viewManager.CreateContainerView(
+        content.rootFolder, [vim.VirtualMachine], True
+    )
+    
+    view_traversal = vim.PropertyCollector.TraversalSpec(
+        name='viewTraversal',
+        type=vim.view.ContainerView,
+        path='view',
+        skip=False
+    )
+    obj_spec = vim.PropertyCollector.ObjectSpec(
+        obj=container_view,
+        skip=True,
+        selectSet=[view_traversal]
+    )
+    prop_spec = vim.PropertyCollector.PropertySpec(
+        type=vim.VirtualMachine,
+        pathSet=VM_PROPERTIES
+    )
+    filter_spec = vim.PropertyCollector.FilterSpec(
+        objectSet=[obj_spec],
+        propSet=[prop_spec]
+    )
+    
+    try:
+        results = content.propertyCollector.RetrieveContents([filter_spec])
+    finally:
+        container_view.Destroy()
+    
+    vms = []
+    for obj_content in results:
+        props = {prop.name: prop.val for prop in obj_content.propSet}
+        vms.append({
+            'moRef': obj_content.obj,
+            'name': props.get('name', ''),
+            'power': props.get('runtime.powerState', 'unknown'),
+            'cpu': props.get('config.hardware.numCPU', 0),
+            'memMB': props.get('config.hardware.memoryMB', 0),
+            'ip': props.get('guest.ipAddress'),
+        })
+    
+    return vms
+
+def invalidate_vm_cache():
+    """Drop the cached inventory so the next search asks vCenter again"""
+    _vm_cache['ts'] = 0
+    _vm_cache['vms'] = None
+
+def search_vms(content, name_filter=None):
+    """Search for VMs by name filter. If no filter, return all VMs"""
+    if _vm_cache['vms'] is None or time.time() - _vm_cache['ts'] >= VM_CACHE_TTL:
+        _vm_cache['vms'] = retrieve_vm_properties(content)
+        _vm_cache['ts'] = time.time()
+    
+    vms = list(_vm_cache['vms'])
+    
+    # Filter VMs if name_filter provided
+    if name_filter:
+        vms = [vm for vm in vms if name_filter.lower() in vm['name'].lower()]
+    
+    return vms
+
+def display_vm_info(vms):
+    """Display VM metadata"""
+    if not vms:
+        print("\nNo VMs found!")
+        return
+        
+    lines = [
+        f"\n{'VM Name':<30} {'Power State':<15} {'CPUs':<8} {'Memory (GB)':<12} {'IP Address':<15}",
+        "=" * 90,
+    ]
+    lines.extend(
+        f"{vm['name']:<30} {vm['power']:<15} {vm['cpu']:<8} {vm['memMB'] / 1024:<12.2f} {vm['ip'] or 'N/A':<15}"
+        for vm in vms
+    )
+    
+    # One write for the whole table instead of a print per VM
+    sys.stdout.write("\n".join(lines) + "\n")